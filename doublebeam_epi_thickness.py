@@ -1,4 +1,6 @@
-# Import required libraries: numpy for numerical calculations, matplotlib for visualization
+# Import required libraries: argparse for command-line options, numpy for numerical calculations, matplotlib for visualization
+import argparse
+
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -32,43 +34,75 @@ class EpilayerThicknessCalculator:
         self.m = m  # Initial interference order
 
         # 2. Pre-calculate basic parameters (avoid repeated calculations)
-        self.cos_theta1 = self._calc_cos_theta1()  # Cosine of refraction angle in epilayer
-        self.k = self._calc_k()  # Interference order correction term
+        self.theta0_rad = np.deg2rad(theta0_deg)  # Incident angle (radians, numpy trigonometric functions require radians)
+        self.sin_theta0 = np.sin(self.theta0_rad)  # Sine of incident angle (reused by every Snell's law evaluation)
+        self.cos_theta1 = self._calc_cos_theta1(self.sin_theta0, n1)  # Cosine of refraction angle in epilayer
+        self.k = self._calc_k(n1, n2, m)  # Interference order correction term
 
         # 3. Initialize result variables (to be assigned after subsequent calculations)
         self.d = None  # Epilayer thickness (cm)
         self.d_dn1 = None  # Sensitivity of thickness to n1 (cm/unit refractive index)
         self.d_dnu = None  # Sensitivity of thickness to wavenumber (cm/(cm^-1))
 
-    def _calc_cos_theta1(self):
+    @staticmethod
+    def _calc_cos_theta1(sin_theta0, n1):
         """
-        Method: Calculate cosine of refraction angle (cos1) in epilayer using Snell's law
+        Method: Calculate cosine of refraction angle (cos1) in epilayer using Snell's law (scalar or array n1)
         :return: cos_theta1 (dimensionless)
         """
-        theta0_rad = np.deg2rad(self.theta0_deg)  # Convert incident angle from degrees to radians (numpy trigonometric functions require radians)
-        sin_theta1 = np.sin(theta0_rad) / self.n1  # Snell's law: sin1 = sin0 / n1 (air refractive index n0=1)
-        cos_theta1 = np.sqrt(1 - sin_theta1 **2)  # Trigonometric identity: sin²θ + cos²θ = 1 (ensure n1>sin0 for real result)
+        sin_theta1 = sin_theta0 / n1  # Snell's law: sin1 = sin0 / n1 (air refractive index n0=1)
+        cos_theta1 = np.sqrt(1 - sin_theta1 * sin_theta1)  # Trigonometric identity: sin²θ + cos²θ = 1 (ensure n1>sin0 for real result)
         return cos_theta1
 
-    def _calc_k(self):
+    @staticmethod
+    def _calc_k(n1, n2, m):
         """
-        Method: Determine interference order correction term k based on the relationship between n1 and n2
+        Method: Determine interference order correction term k based on the relationship between n1 and n2 (scalar or array)
+        Case 1: n2>n1 (optically thinner → optically denser), both reflections have π phase shift, total phase difference cancels, k=m
+        Case 2: n2<n1, only air→epilayer reflection has π shift, total phase difference has extra π, k=m-0.5
         :return: k (dimensionless)
         """
-        if self.n2 > self.n1:
-            # Case 1: n2>n1 (optically thinner → optically denser), both reflections have π phase shift, total phase difference cancels, k=m
-            return self.m
-        else:
-            # Case 2: n2<n1, only air→epilayer reflection has π shift, total phase difference has extra π, k=m-0.5
-            return self.m - 0.5
+        return np.where(np.greater(n2, n1), m, np.subtract(m, 0.5))[()]
+
+    @staticmethod
+    def batch(n1_arr, n2_arr, theta0_deg=15, nu_tilde=1000, m=1):
+        """
+        Vectorized calculation for many material configurations at once (pure NumPy, no per-configuration Python calls)
+        :param n1_arr: Refractive indices of epilayer (array, dimensionless)
+        :param n2_arr: Refractive indices of substrate (array broadcastable with n1_arr, dimensionless)
+        :param theta0_deg: Incident angle(s) in air (unit: degrees, scalar or broadcastable array)
+        :param nu_tilde: Infrared wavenumber(s) (unit: cm^-1, scalar or broadcastable array)
+        :param m: Initial interference order(s) (scalar or broadcastable array)
+        :return: d (thickness, cm), d_dn1 (sensitivity to n1), d_dnu (sensitivity to wavenumber), as arrays
+        """
+        n1 = np.asarray(n1_arr, dtype=float)
+        nu = np.asarray(nu_tilde, dtype=float)
+
+        # cos1 from Snell's law and k from the n1/n2 relationship
+        c = EpilayerThicknessCalculator._calc_cos_theta1(np.sin(np.deg2rad(theta0_deg)), n1)
+        k = EpilayerThicknessCalculator._calc_k(n1, n2_arr, m)
+        return EpilayerThicknessCalculator._thickness_terms(k, c, n1, nu)
+
+    @staticmethod
+    def _thickness_terms(k, cos_theta1, n1, nu_tilde):
+        """
+        Method: Evaluate the thickness formula and its sensitivities from precomputed k and cos1 (scalar or array)
+        :return: d (thickness, cm), d_dn1 (sensitivity to n1), d_dnu (sensitivity to wavenumber)
+        """
+        # Thickness formula d = k / (2 * n1 * cos1 * V) and its partial derivatives with respect to n1 (chain rule) and V
+        # (explicit products instead of ** for the integer powers)
+        d = k / (2 * n1 * cos_theta1 * nu_tilde)
+        d_dn1 = -k / (2 * nu_tilde * n1 * n1 * cos_theta1 * cos_theta1 * cos_theta1)
+        d_dnu = -k / (2 * n1 * cos_theta1 * nu_tilde * nu_tilde)
+        return d, d_dn1, d_dnu
 
     def calculate_thickness(self):
         """
         Calculate epilayer thickness d (core method)
         :return: d (unit: cm)
         """
-        # Substitute into double-beam interference thickness formula: d = k / (2 * n1 * cos1 * V)
-        self.d = self.k / (2 * self.n1 * self.cos_theta1 * self.nu_tilde)
+        # Double-beam interference thickness formula: d = k / (2 * n1 * cos1 * V) (reuses the precomputed k and cos1)
+        self.d = self._thickness_terms(self.k, self.cos_theta1, self.n1, self.nu_tilde)[0]
         return self.d
 
     def calculate_sensitivity(self):
@@ -76,10 +110,8 @@ class EpilayerThicknessCalculator:
         Calculate sensitivity of thickness to key parameters (n1 and wavenumber)
         :return: d_dn1 (sensitivity of thickness to n1), d_dnu (sensitivity of thickness to wavenumber)
         """
-        # 1. Sensitivity of thickness to n1: partial derivative formula (derived using chain rule)
-        self.d_dn1 = -self.k / (2 * self.nu_tilde * self.n1** 2 * self.cos_theta1 **3)
-        # 2. Sensitivity of thickness to wavenumber: partial derivative formula (direct derivative of thickness formula)
-        self.d_dnu = -self.k / (2 * self.n1 * self.cos_theta1 * self.nu_tilde** 2)
+        # Partial derivatives of the thickness formula with respect to n1 and wavenumber (reuses the precomputed k and cos1)
+        self.d_dn1, self.d_dnu = self._thickness_terms(self.k, self.cos_theta1, self.n1, self.nu_tilde)[1:]
         return self.d_dn1, self.d_dnu
 
     def print_results(self):
@@ -102,7 +134,7 @@ class EpilayerThicknessCalculator:
         print("Mathematical Model:")
         print("Epilayer thickness calculation formula: d = k / (2 * n1 * cos1 * V)")
         print("Parameter Explanations:")
-        print(f"   - k: Interference order correction term (current n2={self.n2}, n1={self.n1}, so k={self.k})")
+        print(f"   - k: Interference order correction term (current n2={self.n2}, n1={self.n1}, so k={self.k:g})")
         print(f"   - cos1: Cosine of refraction angle in epilayer (current calculated value: {self.cos_theta1:.8f})")
         print(f"   - V: Infrared light wavenumber (current value: {self.nu_tilde} cm^-1, reciprocal of wavelength λ)")
         print(" ")
@@ -116,42 +148,50 @@ class EpilayerThicknessCalculator:
         print("3. What needs to be known in advance? 'Velocity indices' of n1 (epilayer) and n2 (substrate) (from literature or experimental measurement)")
         print("4. What can be calculated? Epilayer thickness inferred from light incidence angle and wavenumber")
 
+    def compute_sensitivity_curves(self):
+        """
+        Calculate "parameter change-thickness change" curves without any plotting
+        :return: n1_range, d_n1_range (thickness vs. n1), nu_range, d_nu_range (thickness vs. wavenumber)
+        """
+        # Curve 1: Effect of n1 variation on thickness
+        # Generate n1 variation range (±0.1 around default value 2.65, 50 points, simulating experimental error)
+        n1_range = np.linspace(self.n1 - 0.1, self.n1 + 0.1, 50)
+        # Calculate thickness for all n1 at once (cos1 and k depend on n1; sin0 is reused, so no trigonometric call)
+        cos_theta1_range = self._calc_cos_theta1(self.sin_theta0, n1_range)
+        k_range = self._calc_k(n1_range, self.n2, self.m)
+        d_n1_range = self._thickness_terms(k_range, cos_theta1_range, n1_range, self.nu_tilde)[0]
+
+        # Curve 2: Effect of wavenumber variation on thickness
+        # Generate wavenumber variation range (±50 around default value 800 cm^-1, 50 points)
+        nu_range = np.linspace(self.nu_tilde - 50, self.nu_tilde + 50, 50)
+        # Calculate thickness for all wavenumbers at once (cos1 and k are independent of wavenumber, reuse them)
+        d_nu_range = self._thickness_terms(self.k, self.cos_theta1, self.n1, nu_range)[0]
+
+        return n1_range, d_n1_range, nu_range, d_nu_range
+
     def plot_sensitivity(self):
         """
         Visual sensitivity analysis: Plot "parameter change-thickness change" curves to intuitively show sensitivity
         Contains two plots: 1. Effect of epilayer refractive index n1 on thickness; 2. Effect of wavenumber on thickness
         """
-        # First check if basic calculations are completed
-        if self.d is None:
+        # First check if basic calculations are completed (plot titles show thickness and sensitivities)
+        if self.d is None or self.d_dn1 is None or self.d_dnu is None:
             self.calculate_thickness()
+            self.calculate_sensitivity()
 
-        # Plot 1: Effect of n1 variation on thickness
-        # Generate n1 variation range (±0.1 around default value 2.65, 50 points, simulating experimental error)
-        n1_range = np.linspace(self.n1 - 0.1, self.n1 + 0.1, 50)
-        # Calculate thickness for each n1 (need to recalculate cos1 and k as n1 affects cos1)
-        d_n1_range = []
-        for n1 in n1_range:
-            # Temporarily calculate cos1 for current n1 (Snell's law)
-            theta0_rad = np.deg2rad(self.theta0_deg)
-            sin_theta1 = np.sin(theta0_rad) / n1
-            cos_theta1 = np.sqrt(1 - sin_theta1 **2)
-            # Temporarily calculate k (relationship between n2 and current n1)
-            k = self.m if self.n2 > n1 else (self.m - 0.5)
-            # Calculate thickness
-            d = k / (2 * n1 * cos_theta1 * self.nu_tilde)
-            d_n1_range.append(d)
-
-        # Plot 2: Effect of wavenumber variation on thickness
-        # Generate wavenumber variation range (±50 around default value 800 cm^-1, 50 points)
-        nu_range = np.linspace(self.nu_tilde - 50, self.nu_tilde + 50, 50)
-        # Calculate thickness for each wavenumber (cos1 and k are independent of wavenumber, reuse initial values)
-        d_nu_range = [self.k / (2 * self.n1 * self.cos_theta1 * nu) for nu in nu_range]
+        self._render(*self.compute_sensitivity_curves())
 
+    def _render(self, n1_range, d_n1_range, nu_range, d_nu_range):
+        """
+        Draw the sensitivity curves returned by compute_sensitivity_curves (matplotlib work only)
+        """
         # Create plots
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))  # 1 row, 2 columns of subplots, total size 14x5
 
         # Plot 1: n1-thickness relationship
-        ax1.plot(n1_range, d_n1_range, color='#2E86AB', linewidth=2.5, marker='o', markersize=4)
+        # Cap visible markers at ~20 however finely the ranges are sampled
+        ax1.plot(n1_range, d_n1_range, color='#2E86AB', linewidth=2.5, marker='o', markersize=4,
+                 markevery=max(1, len(n1_range) // 20))
         ax1.axvline(x=self.n1, color='red', linestyle='--', alpha=0.8, label=f'Default n1={self.n1}')
         ax1.axhline(y=self.d, color='gray', linestyle='--', alpha=0.8, label=f'Default thickness={self.d:.8f} cm')
         ax1.set_xlabel('Epilayer refractive index n1 (dimensionless)', fontsize=12)
@@ -161,7 +201,8 @@ class EpilayerThicknessCalculator:
         ax1.grid(True, alpha=0.3)
 
         # Plot 2: Wavenumber-thickness relationship
-        ax2.plot(nu_range, d_nu_range, color='#A23B72', linewidth=2.5, marker='s', markersize=4)
+        ax2.plot(nu_range, d_nu_range, color='#A23B72', linewidth=2.5, marker='s', markersize=4,
+                 markevery=max(1, len(nu_range) // 20))
         ax2.axvline(x=self.nu_tilde, color='red', linestyle='--', alpha=0.8, label=f'Default wavenumber={self.nu_tilde} cm^-1')
         ax2.axhline(y=self.d, color='gray', linestyle='--', alpha=0.8, label=f'Default thickness={self.d:.8f} cm')
         ax2.set_xlabel('Infrared wavenumber V (cm^-1)', fontsize=12)
@@ -178,6 +219,12 @@ class EpilayerThicknessCalculator:
 
 # Model usage example
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Double-beam interference epilayer thickness calculation')
+    parser.add_argument('--plot', dest='plot', action='store_true', help='show sensitivity plots (default)')
+    parser.add_argument('--no-plot', dest='plot', action='store_false', help='only print numerical results')
+    parser.set_defaults(plot=True)
+    args = parser.parse_args()
+
     # 1. Initialize calculator (default parameters: SiC material, n1=2.65, n2=2.68, incident angle 15°, wavenumber 1000 cm^-1)
     calculator = EpilayerThicknessCalculator()
 
@@ -188,11 +235,14 @@ if __name__ == "__main__":
     # 3. Print text results
     calculator.print_results()
 
-    # 4. Visual sensitivity analysis (intuitively show parameter effects)
-    calculator.plot_sensitivity()
+    # 4. Visual sensitivity analysis (intuitively show parameter effects, skipped with --no-plot)
+    if args.plot:
+        calculator.plot_sensitivity()
 
     # ---------------------- Extension: Custom parameter example (e.g., changing material) ----------------------
     # To calculate for other materials (e.g., GaN, n1=2.5, n2=2.55), simply pass parameters during initialization:
     # gaN_calculator = EpilayerThicknessCalculator(n1=2.5, n2=2.55, theta0_deg=15, nu_tilde=750, m=2)
     # gaN_calculator.print_results()
-    # gaN_calculator.plot_sensitivity()
\ No newline at end of file
+    # gaN_calculator.plot_sensitivity()
+    # For many materials at once, use the vectorized batch API (arrays in, arrays out):
+    # d, d_dn1, d_dnu = EpilayerThicknessCalculator.batch(n1_arr=[2.5, 2.65], n2_arr=[2.55, 2.68], theta0_deg=15, nu_tilde=1000, m=1)
\ No newline at end of file
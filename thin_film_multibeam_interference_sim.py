@@ -1,7 +1,10 @@
+import argparse
+
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
 from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.lines import Line2D
 
 # Set Chinese fonts (retained for proper display if needed)
 plt.rcParams['font.sans-serif'] = ['SimHei', 'DejaVu Sans']
@@ -17,6 +20,7 @@ a = 25 * np.pi / 180  # Azimuth angle of incident light amplitude (converted to
 theta_max = np.pi / 3  # Angular range of the image field (radians)
 delta_theta = 0.001  # Calculation precision (radians)
 fixed_incident_angle = 15 * np.pi / 180  # Fixed incident angle (15 degrees, converted to radians)
+OUTPUT_FILENAME = 'Thin_film_multiple_beam_interference_simulation_(Fixed_incident_angle=15°).png'  # Saved figure
 
 # Amplitudes of s-wave and p-wave in incident light
 Asi = Ai * np.sin(a)
@@ -29,134 +33,178 @@ def P(rs, rp):
     return (rs * np.sin(a)) ** 2 + (rp * np.cos(a)) ** 2
 
 
-def Rs(i, r):
-    """s-wave reflection coefficient (Fresnel formula)"""
-    return -np.sin(i - r) / np.sin(i + r)
-
-
-def Rp(i, r):
-    """p-wave reflection coefficient (Fresnel formula)"""
-    return np.tan(i - r) / np.tan(i + r)
-
+def fresnel_coefficients(i, n):
+    """cos(r), Rs(i,r), Rp(i,r), Ts(i,r), Ts(r,i), Tp(i,r), Tp(r,i) for incidence angle(s) i into a film of index n
 
-def Ts(i, r):
-    """s-wave transmission coefficient (Fresnel formula)"""
-    return 2 * np.sin(r) * np.cos(i) / np.sin(i + r)
+    Fresnel formulas: Rs(i,r) = -sin(i-r)/sin(i+r), Rp(i,r) = tan(i-r)/tan(i+r),
+    Ts(i,r) = 2*sin(r)*cos(i)/sin(i+r), Tp(i,r) = Ts(i,r)/cos(i-r)
+    """
+    # Snell's law gives sin(r) directly, so r itself is never needed
+    sin_i = np.sin(i)
+    cos_i = np.cos(i)
+    sin_r = sin_i / n
+    cos_r = np.sqrt(1 - sin_r * sin_r)
 
+    # Sum/difference identities replace the per-coefficient sin/cos/tan of (i ± r)
+    cos_ipr = cos_i * cos_r - sin_i * sin_r
+    cos_imr = cos_i * cos_r + sin_i * sin_r
 
-def Tp(i, r):
-    """p-wave transmission coefficient (Fresnel formula)"""
-    return 2 * np.sin(r) * np.cos(i) / (np.sin(i + r) * np.cos(i - r))
+    # The sin(i ± r) ratios of the Fresnel formulas are rewritten with sin(i) = n*sin(r) into the n*cos(r)
+    # form, which stays finite at normal incidence (i = 0, where sin(i + r) vanishes)
+    n_cos_r = n * cos_r
+    fresnel_denom = cos_i + n_cos_r
+    rs = (cos_i - n_cos_r) / fresnel_denom  # Rs(i, r)
+    rp = -rs * cos_ipr / cos_imr  # Rp(i, r)
+    ts_in = 2 * cos_i / fresnel_denom  # Ts(i, r)
+    ts_out = 2 * n_cos_r / fresnel_denom  # Ts(r, i)
+    tp_in = ts_in / cos_imr  # Tp(i, r)
+    tp_out = ts_out / cos_imr  # Tp(r, i)
+    return cos_r, rs, rp, ts_in, ts_out, tp_in, tp_out
 
 
 def calculate_interference(N, lambda_, n, h, Ai, a, theta_max, delta_theta, fixed_angle):
     """Calculate interference results including intensity distributions and amplitudes"""
     # Angle range for interference calculation
-    i1 = np.arange(-theta_max, theta_max + delta_theta, delta_theta)
-    r1 = np.arcsin(np.sin(i1) / n)  # Refraction angle (Snell's law)
+    # (integer point count with linspace: exact ±theta_max endpoints, no float-step overshoot from arange)
+    n_pts = int(round(2 * theta_max / delta_theta)) + 1
+    i1 = np.linspace(-theta_max, theta_max, n_pts)
+
+    # Fresnel coefficients on the angle grid (sin/cos evaluated once, no arcsin)
+    cos_r, rs_in, rp_in, ts_in, ts_out, tp_in, tp_out = fresnel_coefficients(i1, n)
 
     # Phase difference between adjacent transmitted beams
-    delta = 4 * np.pi / lambda_ * n * h * np.cos(r1)
+    delta = 4 * np.pi / lambda_ * n * h * cos_r
 
     # Calculation distinguishing s/p waves
-    As = Asi * Ts(i1, r1) * Ts(r1, i1)
-    Ap = Api * Tp(i1, r1) * Tp(r1, i1)
-
-    # Vectorized operations instead of loops for efficiency
-    powers = np.arange(N)
-    rs_pows = Rs(r1, i1)[:, np.newaxis] ** (2 * powers)
-    rp_pows = Rp(r1, i1)[:, np.newaxis] ** (2 * powers)
-    exp_terms = np.exp(1j * delta)[:, np.newaxis] ** powers
-
-    Ast = As[:, np.newaxis] * rs_pows * exp_terms
-    Apt = Ap[:, np.newaxis] * rp_pows * exp_terms
-
-    It_1 = np.abs(Ast.sum(axis=1)) **2 + np.abs(Apt.sum(axis=1))** 2
+    As = Asi * ts_in * ts_out
+    Ap = Api * tp_in * tp_out
+
+    # The N transmitted orders form a geometric series with ratio z = Rs(r1,i1)**2 * exp(1j*delta)
+    # (likewise for p), so the sum is evaluated in closed form (Airy form): A * (1 - z**N) / (1 - z).
+    # s and p waves are stacked as rows and kept in complex64; the phase factor is evaluated in float64
+    # first, since delta is thousands of radians and float32 would lose the phase
+    rs = -rs_in  # Rs(r1, i1)
+    rp = -rp_in  # Rp(r1, i1)
+    phase = np.exp(1j * delta)
+    z = np.stack([rs * rs * phase, rp * rp * phase]).astype(np.complex64)
+    amplitudes = np.stack([As, Ap]).astype(np.complex64)
+
+    # |z| = |r|² < 1 inside the film, so 1 - z only vanishes in the degenerate z = 1 case (sum = N terms)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        geo = (1 - np.power(z, N)) / (1 - z)
+    geo = np.where(z == 1, np.complex64(N), geo)
+    sums = amplitudes * geo
+
+    # |sum_s|² + |sum_p|² as one fused multiply-and-reduce over the (wave, angle, re/im) float view
+    sums_ri = sums.view(np.float32).reshape(2, len(i1), 2)
+    It_1 = np.einsum('wjc,wjc->j', sums_ri, sums_ri)
 
     # Calculation using textbook formula (without distinguishing s/p waves)
-    rs_vals = Rs(i1, r1)
-    rp_vals = Rp(i1, r1)
-    p = P(rs_vals, rp_vals)
-    It_2 = (1 - p) ** 2 / ((1 - p) ** 2 + 4 * p * np.sin(delta / 2) ** 2) * Ai ** 2
+    p = P(rs_in, rp_in)
+    one_minus_p = 1 - p
+    one_minus_p_sq = one_minus_p * one_minus_p
+    # sin²(delta/2) = (1 - cos(delta))/2, with cos(delta) taken from the phase factor computed above
+    half_sin2 = phase.real * -0.5
+    half_sin2 += 0.5
+    airy_denom = np.multiply(4 * p, half_sin2, out=half_sin2)
+    airy_denom += one_minus_p_sq
+    It_2 = one_minus_p_sq / airy_denom * (Ai * Ai)
 
     # Amplitude directions of transmitted beams of various orders (using fixed incident angle)
     ii = fixed_angle  # Fixed incident angle
-    r = np.arcsin(np.sin(ii) / n)  # Corresponding refraction angle
-    As_dir = Asi * Ts(ii, r) * Ts(r, ii)
-    Ap_dir = Api * Tp(ii, r) * Tp(r, ii)
+    _, rs_dir, rp_dir, ts_dir_in, ts_dir_out, tp_dir_in, tp_dir_out = fresnel_coefficients(ii, n)
+    As_dir = Asi * ts_dir_in * ts_dir_out
+    Ap_dir = Api * tp_dir_in * tp_dir_out
 
-    # Amplitudes of each order
+    # Amplitudes of each order: geometric sequence in the squared reflection coefficient,
+    # built with one cumulative product (N-1 multiplies) instead of elementwise pow
     orders = np.arange(1, N + 1)
-    s_amplitudes = As_dir * (Rs(ii, r) ** 2) ** (orders - 1)
-    p_amplitudes = Ap_dir * (Rp(ii, r) ** 2) ** (orders - 1)
+    s_amplitudes = As_dir * np.concatenate(([1.0], np.cumprod(np.full(N - 1, rs_dir * rs_dir))))
+    p_amplitudes = Ap_dir * np.concatenate(([1.0], np.cumprod(np.full(N - 1, rp_dir * rp_dir))))
 
     return i1, It_1, It_2, s_amplitudes, p_amplitudes, orders
 
 
-# Calculate interference results
-i1, It_1, It_2, s_amplitudes, p_amplitudes, orders = calculate_interference(
-    N, lambda_, n, h, Ai, a, theta_max, delta_theta, fixed_incident_angle)
-
-# Create custom colormap
-colors = [(0, 0, 0), (0.8, 0.2, 0.2), (1, 1, 0), (1, 1, 1)]
-custom_cmap = LinearSegmentedColormap.from_list("custom_hot", colors)
-
-# Create color sequence for the second subplot (using viridis for good distinguishability)
-colors_2nd = plt.cm.viridis(np.linspace(0, 1, len(orders)))
-
-# Create figure
-fig = plt.figure(figsize=(14, 10))
-gs = gridspec.GridSpec(2, 2, height_ratios=[1, 1], width_ratios=[1, 1])
-
-# Subplot 1: Comparison of two calculation results
-ax2 = fig.add_subplot(gs[0, 0])
-ax2.plot(np.rad2deg(i1), It_1, 'b-', linewidth=1.5, label='Distinguishing s/p waves')
-ax2.plot(np.rad2deg(i1), It_2, 'r--', linewidth=1.5, label='Not distinguishing s/p waves')
-ax2.set_xlabel('Interference angle (°)', fontsize=12)
-ax2.set_ylabel('Light intensity', fontsize=12)
-ax2.set_title('Comparison of two calculation results', fontsize=14)
-ax2.legend()
-ax2.grid(True, linestyle='--', alpha=0.7)
-
-# Subplot 2: Amplitude directions of transmitted light of various orders
-ax3 = fig.add_subplot(gs[0, 1])
-# Plot points for each order and add to legend
-for i, (x, y, order, color) in enumerate(zip(s_amplitudes, p_amplitudes, orders, colors_2nd)):
-    # Plot connecting lines
-    if i > 0:
-        ax3.plot([s_amplitudes[i - 1], x], [p_amplitudes[i - 1], y], '-', color=color, alpha=0.5)
-    ax3.plot(x, y, 'o', color=color, markersize=6, label=f'Order {order}')
-
-ax3.set_xlabel('s-wave amplitude', fontsize=12)
-ax3.set_ylabel('p-wave amplitude', fontsize=12)
-ax3.set_title(f'Amplitude directions of transmitted light at incident angle=15°', fontsize=14)
-ax3.grid(True, linestyle='--', alpha=0.7)
-ax3.axis('equal')
-
-# Add legend, adjust position to avoid overlapping data
-ax3.legend(title='Transmitted light order', bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=10)
-
-# Subplot 3: 3D surface plot of intensity distribution
-ax4 = fig.add_subplot(gs[1, :], projection='3d')
-X, Y = np.meshgrid(i1, np.linspace(0, max(It_1), 50))
-Z = np.tile(It_1, (50, 1))
-surf = ax4.plot_surface(np.rad2deg(X), Y, Z, cmap=custom_cmap, alpha=0.85)
-ax4.set_xlabel('Interference angle (°)', fontsize=12)
-ax4.set_ylabel('Intensity', fontsize=12)
-ax4.set_zlabel('Relative intensity', fontsize=12)
-ax4.set_title('Transmitted light intensity distribution', fontsize=14)
-ax4.view_init(30, 45)
-
-# Add color bar
-cbar = fig.colorbar(surf, ax=ax4, shrink=0.7, aspect=10)
-cbar.set_label('Light intensity')
-
-# Adjust main title position (y ranges from 0 to 1, larger values mean higher position)
-plt.suptitle(f'Thin-film multiple-beam interference simulation (Fixed incident angle=15°)', fontsize=16, y=0.98)
-plt.tight_layout()
-
-# Save image to current directory
-plt.savefig('Thin_film_multiple_beam_interference_simulation_(Fixed_incident_angle=15°).png', dpi=300, bbox_inches='tight')
-plt.close()
-
-print("Image saved to current directory with filename: Thin_film_multiple_beam_interference_simulation_(Fixed_incident_angle=15°).png")
\ No newline at end of file
+def plot_interference(i1, It_1, It_2, s_amplitudes, p_amplitudes, orders, filename=OUTPUT_FILENAME, dpi=150):
+    """Render the intensity comparison, amplitude directions and intensity map, and save to filename at dpi"""
+    # Create custom colormap
+    colors = [(0, 0, 0), (0.8, 0.2, 0.2), (1, 1, 0), (1, 1, 1)]
+    custom_cmap = LinearSegmentedColormap.from_list("custom_hot", colors)
+
+    # Create color sequence for the second subplot (using viridis for good distinguishability)
+    colors_2nd = plt.cm.viridis(np.linspace(0, 1, len(orders)))
+
+    # Create figure
+    fig = plt.figure(figsize=(14, 10))
+    gs = gridspec.GridSpec(2, 2, height_ratios=[1, 1], width_ratios=[1, 1])
+
+    # Subplot 1: Comparison of two calculation results
+    ax2 = fig.add_subplot(gs[0, 0])
+    ax2.plot(np.rad2deg(i1), It_1, 'b-', linewidth=1.5, label='Distinguishing s/p waves')
+    ax2.plot(np.rad2deg(i1), It_2, 'r--', linewidth=1.5, label='Not distinguishing s/p waves')
+    ax2.set_xlabel('Interference angle (°)', fontsize=12)
+    ax2.set_ylabel('Light intensity', fontsize=12)
+    ax2.set_title('Comparison of two calculation results', fontsize=14)
+    ax2.legend()
+    ax2.grid(True, linestyle='--', alpha=0.7)
+
+    # Subplot 2: Amplitude directions of transmitted light of various orders
+    ax3 = fig.add_subplot(gs[0, 1])
+    # Plot connecting polyline and all order points with one artist each
+    ax3.plot(s_amplitudes, p_amplitudes, '-', color='gray', alpha=0.5)
+    ax3.scatter(s_amplitudes, p_amplitudes, c=colors_2nd, s=36, zorder=3)
+
+    ax3.set_xlabel('s-wave amplitude', fontsize=12)
+    ax3.set_ylabel('p-wave amplitude', fontsize=12)
+    ax3.set_title(f'Amplitude directions of transmitted light at incident angle=15°', fontsize=14)
+    ax3.grid(True, linestyle='--', alpha=0.7)
+    ax3.axis('equal')
+
+    # Add legend, adjust position to avoid overlapping data
+    legend_handles = [Line2D([], [], linestyle='', marker='o', color=color, markersize=6, label=f'Order {order}')
+                      for order, color in zip(orders, colors_2nd)]
+    ax3.legend(handles=legend_handles, title='Transmitted light order', bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=10)
+
+    # Subplot 3: Intensity distribution map
+    # Intensity is constant along Y, so one image strip (stride-0 broadcast rows, no meshgrid or tile)
+    # shows the same information as a 3-D surface at the cost of a single textured quad
+    ax4 = fig.add_subplot(gs[1, :])
+    im = ax4.imshow(np.broadcast_to(It_1, (20, It_1.size)), aspect='auto', cmap=custom_cmap, origin='lower',
+                    extent=[np.rad2deg(i1[0]), np.rad2deg(i1[-1]), 0, It_1.max()])
+    ax4.set_xlabel('Interference angle (°)', fontsize=12)
+    ax4.set_ylabel('Intensity', fontsize=12)
+    ax4.set_title('Transmitted light intensity distribution', fontsize=14)
+
+    # Add color bar
+    cbar = fig.colorbar(im, ax=ax4)
+    cbar.set_label('Light intensity')
+
+    # Adjust main title position (y ranges from 0 to 1, larger values mean higher position)
+    plt.suptitle(f'Thin-film multiple-beam interference simulation (Fixed incident angle=15°)', fontsize=16, y=0.98)
+    # Fixed margins instead of tight_layout/bbox_inches='tight', which each cost an extra render pass
+    fig.subplots_adjust(left=0.07, right=0.85, top=0.92, bottom=0.08, wspace=0.25, hspace=0.3)
+
+    # Save image to current directory
+    plt.savefig(filename, dpi=dpi)
+    plt.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Thin-film multiple-beam interference simulation')
+    parser.add_argument('--plot', dest='plot', action='store_true', help='render and save the figure (default)')
+    parser.add_argument('--no-plot', dest='plot', action='store_false', help='only compute the interference results')
+    parser.add_argument('--dpi', type=int, default=150, help='resolution of the saved figure (default: 150)')
+    parser.set_defaults(plot=True)
+    args = parser.parse_args()
+
+    # Calculate interference results
+    i1, It_1, It_2, s_amplitudes, p_amplitudes, orders = calculate_interference(
+        N, lambda_, n, h, Ai, a, theta_max, delta_theta, fixed_incident_angle)
+
+    if args.plot:
+        plt.switch_backend('Agg')  # Figure is only saved to file, so use the headless backend
+        plot_interference(i1, It_1, It_2, s_amplitudes, p_amplitudes, orders, dpi=args.dpi)
+        print(f"Image saved to current directory with filename: {OUTPUT_FILENAME}")
+    else:
+        print(f"Computed {len(i1)} interference angles: max intensity {It_1.max():.6f} (s/p waves), "
+              f"{It_2.max():.6f} (textbook formula)")